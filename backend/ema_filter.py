@@ -3,6 +3,68 @@ EMA Filter (Exponential Moving Average)
 포인터 떨림 방지를 위한 지수 이동 평균 필터
 """
 import numpy as np
+from typing import Optional
+
+try:
+    from numba import njit
+except ImportError:  # numba 미설치 환경에서는 NumPy 경로 사용
+    njit = None
+
+try:
+    from scipy.signal import lfilter, lfilter_zi
+except ImportError:  # scipy 미설치 시 update_batch는 프레임 단위 update로 처리
+    lfilter = None
+
+
+# 랜드마크/필터 상태 정밀도
+# float16은 x86 NumPy/numba에서 원소마다 float32 변환을 거치므로 오히려 느림 -> float32 유지
+LANDMARK_DTYPE = np.float32
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _ema_step(out, x, alpha, one_minus_alpha):
+        """EMA 한 스텝을 out 버퍼에 제자리(in-place) 갱신"""
+        for i in range(out.shape[0]):
+            for j in range(out.shape[1]):
+                out[i, j] = alpha * x[i, j] + one_minus_alpha * out[i, j]
+    
+    @njit(cache=True, fastmath=True)
+    def _ema_batch_step(state, x, present, initialized, alpha, one_minus_alpha):
+        """여러 손의 EMA를 한 번에 갱신 (감지된 손만, 첫 감지는 그대로 복사)"""
+        for h in range(state.shape[0]):
+            if not present[h]:
+                continue
+            if initialized[h]:
+                for i in range(state.shape[1]):
+                    for j in range(state.shape[2]):
+                        state[h, i, j] = alpha * x[h, i, j] + one_minus_alpha * state[h, i, j]
+            else:
+                state[h] = x[h]
+                initialized[h] = True
+    
+    # 첫 프레임에서 JIT 컴파일 지연이 생기지 않도록 모듈 로드 시 미리 컴파일
+    _warmup = np.zeros((1, 3), dtype=LANDMARK_DTYPE)
+    _ema_step(_warmup, _warmup, 0.5, 0.5)
+    _ema_batch_step(
+        _warmup[None], _warmup[None], np.ones(1, dtype=np.bool_), np.zeros(1, dtype=np.bool_), 0.5, 0.5
+    )
+    del _warmup
+else:
+    def _ema_step(out, x, alpha, one_minus_alpha):
+        """EMA 한 스텝을 out 버퍼에 제자리(in-place) 갱신 (NumPy fallback)"""
+        # (1 - α) * (out - x) + x = α * x + (1 - α) * out, 임시 배열 없이 계산
+        np.subtract(out, x, out=out)
+        np.multiply(out, one_minus_alpha, out=out)
+        np.add(out, x, out=out)
+    
+    def _ema_batch_step(state, x, present, initialized, alpha, one_minus_alpha):
+        """여러 손의 EMA를 한 번에 갱신 (NumPy fallback)"""
+        blend = present & initialized
+        state[blend] = alpha * x[blend] + one_minus_alpha * state[blend]
+        fresh = present & ~initialized
+        state[fresh] = x[fresh]
+        initialized |= present
 
 
 class EMAFilter:
@@ -20,6 +82,7 @@ class EMAFilter:
                    - 클수록 민감함 (떨림 증가)
         """
         self.alpha = alpha
+        self._one_minus_alpha = 1.0 - alpha
         self.ema_x = None
         self.ema_y = None
     
@@ -39,8 +102,8 @@ class EMAFilter:
             self.ema_x = x
             self.ema_y = y
         else:
-            self.ema_x = self.alpha * x + (1 - self.alpha) * self.ema_x
-            self.ema_y = self.alpha * y + (1 - self.alpha) * self.ema_y
+            self.ema_x = self.alpha * x + self._one_minus_alpha * self.ema_x
+            self.ema_y = self.alpha * y + self._one_minus_alpha * self.ema_y
         
         return self.ema_x, self.ema_y
     
@@ -64,7 +127,14 @@ class MultiPointEMAFilter:
     def __init__(self, num_points: int = 21, alpha: float = 0.2):
         self.num_points = num_points
         self.alpha = alpha
-        self.ema_values = None
+        # 프레임마다 새 배열을 만들지 않도록 상태 버퍼를 미리 할당
+        self._one_minus_alpha = 1.0 - alpha
+        self.ema_values = np.empty((num_points, 3), dtype=LANDMARK_DTYPE)
+        self._initialized = False
+        
+        # 배치 처리용 IIR 계수: y[t] = α * x[t] + (1 - α) * y[t-1]
+        self._b = np.array([alpha], dtype=LANDMARK_DTYPE)
+        self._a = np.array([1.0, -self._one_minus_alpha], dtype=LANDMARK_DTYPE)
     
     def update(self, landmarks: np.ndarray) -> np.ndarray:
         """
@@ -74,15 +144,86 @@ class MultiPointEMAFilter:
             landmarks: shape (21, 3) 배열 (x, y, z)
             
         Returns:
-            필터링된 랜드마크 배열
+            필터링된 랜드마크 배열 (내부 버퍼이므로 다음 update 호출 시 덮어써짐)
         """
-        if self.ema_values is None:
-            self.ema_values = landmarks.copy()
+        if not self._initialized:
+            np.copyto(self.ema_values, landmarks)
+            self._initialized = True
         else:
-            self.ema_values = self.alpha * landmarks + (1 - self.alpha) * self.ema_values
+            _ema_step(self.ema_values, landmarks, self.alpha, self._one_minus_alpha)
         
         return self.ema_values
     
+    def update_batch(self, landmarks_seq: np.ndarray) -> np.ndarray:
+        """
+        여러 프레임을 한 번에 필터링 (오프라인 재생 / 캘리브레이션 워밍업용)
+        
+        Args:
+            landmarks_seq: shape (T, 21, 3) 배열
+            
+        Returns:
+            프레임별 필터링된 랜드마크 배열 shape (T, 21, 3)
+        """
+        if len(landmarks_seq) == 0:
+            return np.empty((0, self.num_points, 3), dtype=self.ema_values.dtype)
+        
+        if lfilter is None:
+            return np.stack([self.update(landmarks).copy() for landmarks in landmarks_seq])
+        
+        x = np.asarray(landmarks_seq, dtype=LANDMARK_DTYPE).reshape(len(landmarks_seq), -1)
+        if self._initialized:
+            # 이전 EMA 값에서 이어서 필터링
+            zi = self._one_minus_alpha * self.ema_values.reshape(1, -1)
+        else:
+            # 첫 프레임을 그대로 사용하는 update와 동일한 초기 조건
+            zi = lfilter_zi(self._b, self._a)[:, None] * x[:1]
+        
+        y, _ = lfilter(self._b, self._a, x, axis=0, zi=zi)
+        y = y.reshape(len(landmarks_seq), self.num_points, 3).astype(LANDMARK_DTYPE, copy=False)
+        
+        np.copyto(self.ema_values, y[-1])
+        self._initialized = True
+        return y
+    
     def reset(self):
         """필터 상태 초기화"""
-        self.ema_values = None
+        self._initialized = False
+
+
+class MultiHandEMAFilter:
+    """
+    여러 손의 랜드마크를 (손 개수, 21, 3) 배열 하나로 묶어 처리하는 EMA 필터
+    손마다 별도 필터를 호출하는 대신 감지된 손 전체를 한 번에 갱신
+    """
+    
+    def __init__(self, num_hands: int = 2, num_points: int = 21, alpha: float = 0.2):
+        self.num_hands = num_hands
+        self.num_points = num_points
+        self.alpha = alpha
+        self._one_minus_alpha = 1.0 - alpha
+        self.ema_values = np.empty((num_hands, num_points, 3), dtype=LANDMARK_DTYPE)
+        self._initialized = np.zeros(num_hands, dtype=np.bool_)
+    
+    def update(self, landmarks: np.ndarray, present: np.ndarray) -> np.ndarray:
+        """
+        감지된 손들의 랜드마크 일괄 업데이트
+        
+        Args:
+            landmarks: shape (num_hands, 21, 3) 배열 (감지되지 않은 슬롯의 값은 무시됨)
+            present: shape (num_hands,) bool 배열, 이번 프레임에 감지된 슬롯
+            
+        Returns:
+            필터링된 랜드마크 배열 shape (num_hands, 21, 3)
+            (내부 버퍼이므로 다음 update 호출 시 덮어써짐)
+        """
+        _ema_batch_step(
+            self.ema_values, landmarks, present, self._initialized, self.alpha, self._one_minus_alpha
+        )
+        return self.ema_values
+    
+    def reset(self, hand_idx: Optional[int] = None):
+        """필터 상태 초기화 (hand_idx가 None이면 모든 손)"""
+        if hand_idx is None:
+            self._initialized[:] = False
+        else:
+            self._initialized[hand_idx] = False
@@ -2,9 +2,64 @@
 Gesture Recognizer
 손 제스처 인식 알고리즘
 """
+import math
 import numpy as np
 from typing import Optional, List
 import time
+from ema_filter import LANDMARK_DTYPE
+
+try:
+    from numba import njit
+except ImportError:  # numba 미설치 환경에서는 NumPy 경로 사용
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _pinch_distances_sq(landmarks, thumb_idx, tip_idx, out):
+        """엄지 끝과 각 손가락 끝 사이의 2D 제곱 거리를 out에 기록"""
+        thumb_x = landmarks[thumb_idx, 0]
+        thumb_y = landmarks[thumb_idx, 1]
+        for k in range(tip_idx.shape[0]):
+            dx = thumb_x - landmarks[tip_idx[k], 0]
+            dy = thumb_y - landmarks[tip_idx[k], 1]
+            out[k] = dx * dx + dy * dy
+    
+    # 첫 프레임에서 JIT 컴파일 지연이 생기지 않도록 모듈 로드 시 미리 컴파일
+    _pinch_distances_sq(
+        np.zeros((21, 3), dtype=LANDMARK_DTYPE), 4, np.array([8, 12, 16, 20]), np.empty(4, dtype=LANDMARK_DTYPE)
+    )
+else:
+    def _pinch_distances_sq(landmarks, thumb_idx, tip_idx, out):
+        """엄지 끝과 각 손가락 끝 사이의 2D 제곱 거리를 out에 기록 (NumPy fallback)"""
+        diffs = landmarks[tip_idx, :2] - landmarks[thumb_idx, :2]
+        np.einsum('ij,ij->i', diffs, diffs, out=out)
+
+
+# 손가락 이름 (hand_tracker의 손가락 끝 배열 행 순서와 동일)
+FINGER_NAMES = ('thumb', 'index', 'middle', 'ring', 'pinky')
+
+
+class FingerState:
+    """손가락 하나에 대한 제스처 상태 (dict 대신 __slots__로 속성 접근 비용 절감)"""
+    __slots__ = ('dwell_start', 'dwell_x', 'dwell_y', 'pinch_start', 'was_pinching')
+    
+    def __init__(self):
+        self.dwell_start = None     # None이면 체류 기준 위치(dwell_x, dwell_y) 미설정
+        self.dwell_x = 0.0
+        self.dwell_y = 0.0
+        self.pinch_start = None
+        self.was_pinching = False
+
+
+class HandState:
+    """손 하나에 대한 제스처 상태"""
+    __slots__ = ('fingers', 'fist_start', 'was_fist')
+    
+    def __init__(self):
+        self.fingers = {name: FingerState() for name in FINGER_NAMES}
+        self.fist_start = None
+        self.was_fist = False
 
 
 class GestureRecognizer:
@@ -29,6 +84,10 @@ class GestureRecognizer:
     RING_MCP = 13
     PINKY_MCP = 17
     
+    # 주먹 판정용 (검지~새끼) 손가락 끝 / MCP 인덱스
+    _TIP_IDX = np.array([INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP])
+    _MCP_IDX = np.array([INDEX_MCP, MIDDLE_MCP, RING_MCP, PINKY_MCP])
+    
     def __init__(
         self,
         pinch_threshold: float = 0.05,
@@ -45,140 +104,141 @@ class GestureRecognizer:
         self.dwell_time = dwell_time
         self.dwell_radius = dwell_radius
         
+        # 거리 비교는 제곱값으로 수행 (sqrt 생략)
+        self._pinch_thresh_sq = pinch_threshold ** 2
+        self._dwell_radius_sq = dwell_radius ** 2
+        self._fold_ratio_sq = 1.1 ** 2
+        
+        # 엄지-검지~새끼 제곱 거리 버퍼 (_TIP_IDX 순서)
+        self._pinch_d2 = np.empty(len(self._TIP_IDX), dtype=LANDMARK_DTYPE)
+        # detect_pinch 단일 손가락용 인덱스/거리 버퍼 (커널 시그니처를 recognize와 동일하게 유지)
+        self._single_tip_idx = np.empty(1, dtype=self._TIP_IDX.dtype)
+        self._single_d2 = np.empty(1, dtype=LANDMARK_DTYPE)
+        
         # 양손 독립적 상태 추적
         self.states = {
             'Left': self._init_hand_state(),
             'Right': self._init_hand_state()
         }
     
-    def _init_hand_state(self) -> dict:
+    def _init_hand_state(self) -> HandState:
         """손 하나에 대한 상태 초기화"""
-        return {
-            'fingers': {
-                'thumb': self._init_finger_state(),
-                'index': self._init_finger_state(),
-                'middle': self._init_finger_state(),
-                'ring': self._init_finger_state(),
-                'pinky': self._init_finger_state(),
-            },
-            'fist_start_time': None,
-            'was_fist': False
-        }
-    
-    def _init_finger_state(self) -> dict:
-        """손가락 하나에 대한 상태 초기화"""
-        return {
-            'dwell_start_time': None,
-            'dwell_position': None,
-            'pinch_start_time': None,
-            'was_pinching': False
-        }
+        return HandState()
     
-    def _calculate_distance(self, p1: np.ndarray, p2: np.ndarray) -> float:
-        """두 점 사이의 유클리드 거리 계산"""
-        return np.linalg.norm(p1 - p2)
-    
-    def _is_finger_folded(self, landmarks: np.ndarray, tip_idx: int, mcp_idx: int) -> bool:
-        """손가락이 접혀있는지 확인"""
-        tip = landmarks[tip_idx]
-        mcp = landmarks[mcp_idx]
-        wrist = landmarks[self.WRIST]
-        
-        tip_to_wrist = self._calculate_distance(tip, wrist)
-        mcp_to_wrist = self._calculate_distance(mcp, wrist)
-        
-        return tip_to_wrist < mcp_to_wrist * 1.1
-    
-    def detect_pinch(self, landmarks: np.ndarray, label: str, finger_name: str, tip_idx: int) -> dict:
+    def detect_pinch(
+        self,
+        landmarks: np.ndarray,
+        label: str,
+        finger_name: str,
+        tip_idx: int,
+        now: Optional[float] = None
+    ) -> dict:
         """핀치 제스처 감지 (엄지 vs 특정 손가락)"""
         if finger_name == 'thumb':
             return {'is_pinching': False, 'pinch_triggered': False}
-            
-        state = self.states[label]['fingers'][finger_name]
-        thumb_tip = landmarks[self.THUMB_TIP]
-        finger_tip = landmarks[tip_idx]
-        
-        distance = float(self._calculate_distance(thumb_tip[:2], finger_tip[:2]))
-        is_pinching = bool(distance < self.pinch_threshold)
         
-        pinch_triggered = False
-        current_time = time.time()
+        # recognize와 같은 커널로 거리 계산
+        landmarks = np.asarray(landmarks, dtype=LANDMARK_DTYPE)
+        self._single_tip_idx[0] = tip_idx
+        _pinch_distances_sq(landmarks, self.THUMB_TIP, self._single_tip_idx, self._single_d2)
         
-        if is_pinching:
-            if state['pinch_start_time'] is None:
-                state['pinch_start_time'] = current_time
-            elif current_time - state['pinch_start_time'] >= self.pinch_hold_time:
-                if not state['was_pinching']:
-                    pinch_triggered = True
-                    state['was_pinching'] = True
-        else:
-            state['pinch_start_time'] = None
-            state['was_pinching'] = False
-            
+        current_time = time.monotonic() if now is None else now
+        return self._pinch_result(
+            self.states[label].fingers[finger_name], float(self._single_d2[0]), current_time
+        )
+    
+    def _pinch_result(self, state: FingerState, distance_sq: float, now: float) -> dict:
+        """엄지-손가락 제곱 거리로 핀치 판정 및 상태 갱신 (제곱값 비교로 sqrt는 결과 보고 시 한 번만)"""
+        is_pinching = distance_sq < self._pinch_thresh_sq
         return {
             'is_pinching': is_pinching,
-            'pinch_triggered': pinch_triggered,
-            'distance': distance
+            'pinch_triggered': self._update_pinch_state(state, is_pinching, now),
+            'distance': math.sqrt(distance_sq)
         }
 
-    def detect_fist(self, landmarks: np.ndarray, label: str) -> dict:
+    def _update_pinch_state(self, state: FingerState, is_pinching: bool, now: float) -> bool:
+        """핀치 유지 시간 상태 갱신, 이번 프레임에 핀치가 트리거되었는지 반환"""
+        if is_pinching:
+            if state.pinch_start is None:
+                state.pinch_start = now
+            elif now - state.pinch_start >= self.pinch_hold_time:
+                if not state.was_pinching:
+                    state.was_pinching = True
+                    return True
+        else:
+            state.pinch_start = None
+            state.was_pinching = False
+        return False
+
+    def detect_fist(self, landmarks: np.ndarray, label: str, now: Optional[float] = None) -> dict:
         """주먹 제스처 감지 (All Clear)"""
         state = self.states[label]
         
-        fingers_folded = [
-            self._is_finger_folded(landmarks, self.INDEX_TIP, self.INDEX_MCP),
-            self._is_finger_folded(landmarks, self.MIDDLE_TIP, self.MIDDLE_MCP),
-            self._is_finger_folded(landmarks, self.RING_TIP, self.RING_MCP),
-            self._is_finger_folded(landmarks, self.PINKY_TIP, self.PINKY_MCP),
-        ]
+        # 4개 손가락의 손목 기준 거리를 한 번에 계산 (제곱 거리 비교로 sqrt 생략)
+        wrist = landmarks[self.WRIST]
+        tips = landmarks[self._TIP_IDX] - wrist
+        mcps = landmarks[self._MCP_IDX] - wrist
+        tip_d2 = np.einsum('ij,ij->i', tips, tips)
+        mcp_d2 = np.einsum('ij,ij->i', mcps, mcps)
         
-        is_fist = bool(all(fingers_folded))
+        # 손가락 끝이 MCP보다 손목에 가까우면(1.1배 여유) 접힌 것으로 판단
+        folded_mask = tip_d2 < mcp_d2 * self._fold_ratio_sq
+        is_fist = bool(folded_mask.all())
         fist_triggered = False
-        current_time = time.time()
+        current_time = time.monotonic() if now is None else now
         
         if is_fist:
-            if state['fist_start_time'] is None:
-                state['fist_start_time'] = current_time
-            elif current_time - state['fist_start_time'] >= self.fist_hold_time:
-                if not state['was_fist']:
+            if state.fist_start is None:
+                state.fist_start = current_time
+            elif current_time - state.fist_start >= self.fist_hold_time:
+                if not state.was_fist:
                     fist_triggered = True
-                    state['was_fist'] = True
+                    state.was_fist = True
         else:
-            state['fist_start_time'] = None
-            state['was_fist'] = False
+            state.fist_start = None
+            state.was_fist = False
         
         return {
             'is_fist': is_fist,
             'fist_triggered': fist_triggered
         }
     
-    def detect_dwell(self, tip_pos: np.ndarray, label: str, finger_name: str) -> dict:
+    def detect_dwell(
+        self,
+        tip_pos: np.ndarray,
+        label: str,
+        finger_name: str,
+        now: Optional[float] = None
+    ) -> dict:
         """체류 시간 기반 입력 감지 (손가락별)"""
-        state = self.states[label]['fingers'][finger_name]
-        current_time = time.time()
+        state = self.states[label].fingers[finger_name]
+        current_time = time.monotonic() if now is None else now
         
-        if state['dwell_position'] is None:
-            state['dwell_position'] = (float(tip_pos[0]), float(tip_pos[1]))
-            state['dwell_start_time'] = current_time
+        if state.dwell_start is None:
+            state.dwell_x = float(tip_pos[0])
+            state.dwell_y = float(tip_pos[1])
+            state.dwell_start = current_time
             return {'dwell_progress': 0.0, 'dwell_triggered': False}
         
-        distance = self._calculate_distance(
-            np.array(state['dwell_position']),
-            tip_pos[:2]
-        )
+        # 스칼라 연산으로 비교 (프레임마다 배열을 만들지 않음)
+        tip_x = float(tip_pos[0])
+        tip_y = float(tip_pos[1])
+        dx = tip_x - state.dwell_x
+        dy = tip_y - state.dwell_y
         
-        if distance > self.dwell_radius:
-            state['dwell_position'] = (float(tip_pos[0]), float(tip_pos[1]))
-            state['dwell_start_time'] = current_time
+        if dx * dx + dy * dy > self._dwell_radius_sq:
+            state.dwell_x = tip_x
+            state.dwell_y = tip_y
+            state.dwell_start = current_time
             return {'dwell_progress': 0.0, 'dwell_triggered': False}
         
-        elapsed = current_time - state['dwell_start_time']
+        elapsed = current_time - state.dwell_start
         progress = float(min(elapsed / self.dwell_time, 1.0))
         
         dwell_triggered = False
         if progress >= 1.0:
             dwell_triggered = True
-            state['dwell_start_time'] = current_time
+            state.dwell_start = current_time
         
         return {
             'dwell_progress': progress,
@@ -188,6 +248,8 @@ class GestureRecognizer:
     def recognize(self, hands_data: List[dict]) -> List[dict]:
         """모든 손과 손가락의 인식 통합"""
         results = []
+        # 프레임당 한 번만 시각을 읽어 모든 감지기에 전달
+        now = time.monotonic()
         detected_labels = [hand['label'] for hand in hands_data]
         
         # 감지되지 않은 손 리셋
@@ -204,22 +266,34 @@ class GestureRecognizer:
         }
 
         for hand in hands_data:
-            landmarks = hand['landmarks']
+            # 추적기와 같은 정밀도로 통일 (이미 LANDMARK_DTYPE이면 복사 없음)
+            landmarks = np.asarray(hand['landmarks'], dtype=LANDMARK_DTYPE)
             label = hand['label']
+            finger_states = self.states[label].fingers
+            
+            # 엄지-나머지 4개 손가락 2D 제곱 거리를 한 번에 계산 (_TIP_IDX 순서: 검지~새끼)
+            pinch_d2 = self._pinch_d2
+            _pinch_distances_sq(landmarks, self.THUMB_TIP, self._TIP_IDX, pinch_d2)
             
             finger_results = {}
-            for f_name, tip_idx in finger_map.items():
+            for k, (f_name, tip_idx) in enumerate(finger_map.items()):
                 tip_pos = landmarks[tip_idx]
+                
+                if f_name == 'thumb':
+                    pinch = self.detect_pinch(landmarks, label, f_name, tip_idx, now)
+                else:
+                    pinch = self._pinch_result(finger_states[f_name], float(pinch_d2[k - 1]), now)
+                
                 finger_results[f_name] = {
                     'pointer': (float(tip_pos[0]), float(tip_pos[1])),
-                    'dwell': self.detect_dwell(tip_pos, label, f_name),
-                    'pinch': self.detect_pinch(landmarks, label, f_name, tip_idx)
+                    'dwell': self.detect_dwell(tip_pos, label, f_name, now),
+                    'pinch': pinch
                 }
             
             results.append({
                 'label': label,
                 'fingers': finger_results,
-                'fist': self.detect_fist(landmarks, label)
+                'fist': self.detect_fist(landmarks, label, now)
             })
             
         return results
@@ -2,21 +2,30 @@
 Hand Tracker
 MediaPipe Hands를 활용한 손 랜드마크 추적 모듈
 """
-import cv2
-import numpy as np
-import mediapipe as mp
-from typing import Optional, Tuple, List
-from ema_filter import MultiPointEMAFilter
-
-
 import cv2
 import numpy as np
 import mediapipe as mp
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
+from mediapipe.framework.formats import landmark_pb2
 from typing import Optional, Tuple, List
 import os
-from ema_filter import MultiPointEMAFilter
+import queue
+import sys
+import threading
+import time
+from ema_filter import LANDMARK_DTYPE, MultiHandEMAFilter
+from kalman_filter import HandIdentityTracker
+from gesture_recognizer import FINGER_NAMES
+
+
+def _put_latest(q: queue.Queue, item):
+    """큐가 가득 차 있으면 가장 오래된 항목을 버리고 최신 항목을 넣음 (단일 생산자 전용)"""
+    try:
+        q.get_nowait()
+    except queue.Empty:
+        pass
+    q.put_nowait(item)
 
 
 class HandTracker:
@@ -25,6 +34,10 @@ class HandTracker:
     21개의 손 관절 랜드마크 추적 및 F/J 홈키 기반 캘리브레이션 지원
     """
     
+    # 손가락 끝 랜드마크 인덱스 (get_all_fingertips 반환 배열의 행 순서)
+    FINGERTIP_NAMES = FINGER_NAMES
+    _FINGERTIP_IDX = np.array([4, 8, 12, 16, 20])
+    
     def __init__(
         self,
         model_path: str = "backend/hand_landmarker.task",
@@ -32,7 +45,12 @@ class HandTracker:
         min_detection_confidence: float = 0.7,
         min_presence_confidence: float = 0.5,
         min_tracking_confidence: float = 0.5,
-        ema_alpha: float = 0.3
+        ema_alpha: float = 0.3,
+        use_gpu: bool = True,
+        inference_max_side: Optional[int] = 320,
+        enable_motion_gate: bool = False,
+        motion_threshold: float = 8.0,
+        max_gated_frames: int = 5
     ):
         """
         Args:
@@ -40,74 +58,192 @@ class HandTracker:
             max_num_hands: 추적할 최대 손 개수
             min_detection_confidence: 손 감지 최소 신뢰도
             ema_alpha: EMA 필터 평활 계수
+            use_gpu: GPU delegate 사용 여부 (Linux/macOS, MediaPipe 0.10.8 이상에서 지원.
+                     Windows 등 미지원 환경에서는 자동으로 CPU delegate 사용)
+            inference_max_side: 추론 입력의 긴 변 최대 길이 (종횡비 유지, 이보다 작은 프레임은 그대로 사용).
+                                None이면 항상 원본 크기 사용
+                            (랜드마크는 정규화 좌표이므로 해상도와 무관)
+            enable_motion_gate: 화면 변화가 거의 없으면 추론을 건너뛰고 이전 결과 재사용 (기본 꺼짐)
+            motion_threshold: 80x60 흑백 축소 영상에서 블록별 밝기 차이의 최댓값 임계값 (0~255)
+                              - 전체 평균은 손바닥이 멈춘 채 손가락만 움직이면 1 안팎이라 구분 불가
+                              - 640x480, 노이즈 σ=3 기준 8x8 블록 평균의 노이즈 최댓값은 2~3,
+                                손가락이 2px만 움직여도 가장자리 블록은 15 이상 변함 -> 그 사이 값 8
+            max_gated_frames: 연속으로 추론을 건너뛸 최대 프레임 수
+                              (게이트가 움직임을 놓쳐도 이 프레임 수 안에 결과가 갱신됨)
         """
         # 절대 경로 처리
         if not os.path.isabs(model_path):
             base_dir = os.path.dirname(os.path.abspath(__file__))
             model_path = os.path.join(base_dir, os.path.basename(model_path))
 
-        base_options = python.BaseOptions(model_asset_path=model_path)
-        options = vision.HandLandmarkerOptions(
-            base_options=base_options,
-            running_mode=vision.RunningMode.IMAGE,
-            num_hands=max_num_hands,
-            min_hand_detection_confidence=min_detection_confidence,
-            min_hand_presence_confidence=min_presence_confidence,
-            min_tracking_confidence=min_tracking_confidence
-        )
-        self.detector = vision.HandLandmarker.create_from_options(options)
+        def create_detector(delegate):
+            base_options = python.BaseOptions(model_asset_path=model_path, delegate=delegate)
+            options = vision.HandLandmarkerOptions(
+                base_options=base_options,
+                # VIDEO 모드: 이전 프레임의 손 ROI를 재사용해 손이 추적 중일 때 손바닥 검출 단계를 생략
+                running_mode=vision.RunningMode.VIDEO,
+                num_hands=max_num_hands,
+                min_hand_detection_confidence=min_detection_confidence,
+                min_hand_presence_confidence=min_presence_confidence,
+                min_tracking_confidence=min_tracking_confidence
+            )
+            return vision.HandLandmarker.create_from_options(options)
         
-        # EMA 필터 (손마다 별도로 관리: 최대 2개)
-        self.filters = [MultiPointEMAFilter(num_points=21, alpha=ema_alpha) for _ in range(max_num_hands)]
+        # GPU delegate 우선 사용, 지원되지 않는 환경(Windows, GPU 없음)에서는 CPU로 대체
+        self.detector = None
+        self.uses_gpu = False
+        if use_gpu:
+            try:
+                self.detector = create_detector(python.BaseOptions.Delegate.GPU)
+                self.uses_gpu = True
+            except (RuntimeError, NotImplementedError) as e:
+                print(f"⚠️ GPU delegate 사용 불가, CPU로 대체합니다: {e}")
+        if self.detector is None:
+            self.detector = create_detector(python.BaseOptions.Delegate.CPU)
+        
+        # EMA 필터 (손 슬롯별 상태를 하나의 배열로 묶어 한 번에 갱신: 최대 2개)
+        self.ema_filter = MultiHandEMAFilter(num_hands=max_num_hands, num_points=21, alpha=ema_alpha)
         self.max_num_hands = max_num_hands
         
+        # 손목 위치 칼만 예측으로 감지된 손을 필터 슬롯에 배정 (감지 순서가 바뀌어도 같은 필터 유지)
+        self.identity_tracker = HandIdentityTracker(num_slots=max_num_hands)
+        
+        # 랜드마크 변환용 버퍼 (프레임마다 리스트/배열을 새로 만들지 않음)
+        self._lm_buf = np.empty((max_num_hands, 21, 3), dtype=LANDMARK_DTYPE)
+        # 이번 프레임에 감지된 슬롯 표시
+        self._present = np.zeros(max_num_hands, dtype=np.bool_)
+        # BGR -> RGB 변환 결과 버퍼 (첫 프레임 또는 해상도 변경 시 할당)
+        self._rgb_buf = None
+        # 추론용 축소 프레임 버퍼 (inference_max_side 사용 시)
+        self._small_buf = None
+        self.inference_max_side = inference_max_side
+        
+        # 모션 게이트: 마지막으로 추론한 프레임의 축소 흑백 영상과 그 결과
+        self.enable_motion_gate = enable_motion_gate
+        self.motion_threshold = motion_threshold
+        self.max_gated_frames = max_gated_frames
+        self._gated_frames = 0
+        self._prev_small = None
+        self._last_result = None
+        
+        # VIDEO 모드 타임스탬프 (단조 증가해야 함)
+        self._last_timestamp_ms = -1
+        
         # 캘리브레이션 데이터 (Anchor 포인트: F/J 키)
-        self.calibration_offset = np.array([0.0, 0.0])
+        # 랜드마크와 같은 dtype, (1, 2) 형태로 저장해 업캐스트/임시 배열 없이 브로드캐스트
+        self.calibration_offset = np.zeros((1, 2), dtype=LANDMARK_DTYPE)
         self.is_calibrated = False
         
         # 시각화용 mp utils
         self.mp_hands = mp.solutions.hands
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
+        
+        # 그리기 스타일과 랜드마크 proto는 한 번만 만들고 매 프레임 재사용
+        self._landmark_style = self.mp_drawing_styles.get_default_hand_landmarks_style()
+        self._connection_style = self.mp_drawing_styles.get_default_hand_connections_style()
+        self._landmark_proto = landmark_pb2.NormalizedLandmarkList()
+        self._landmark_proto.landmark.extend([landmark_pb2.NormalizedLandmark() for _ in range(21)])
 
-    def process_frame(self, frame: np.ndarray) -> Tuple[List[dict], np.ndarray]:
+    def process_frame(self, frame: np.ndarray, draw: bool = True) -> Tuple[List[dict], Optional[np.ndarray]]:
         """
         프레임에서 손 랜드마크 추출 (멀티 핸드 지원)
         
+        Args:
+            frame: BGR 프레임
+            draw: False이면 프레임 복사와 랜드마크 시각화를 생략
+        
         Returns:
             (hands_data, annotated_frame)
-            - hands_data: [{'landmarks': np.ndarray, 'label': str}, ...]
-            - annotated_frame: 랜드마크가 그려진 프레임
+            - hands_data: [{'landmarks': np.ndarray, 'label': str, 'fingers': np.ndarray}, ...]
+                          (landmarks는 호출자 소유의 복사본)
+            - annotated_frame: 랜드마크가 그려진 프레임 (draw=False이면 None,
+                               감지된 손이 없으면 입력 frame 자체)
         """
-        # BGR -> RGB 변환 (MediaPipe Tasks 이미지 객체 생성)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        result = None
         
-        # MediaPipe 처리
-        result = self.detector.detect(mp_image)
+        # 직전 추론 프레임과 거의 같으면 MediaPipe 추론 생략 (최대 max_gated_frames 프레임 연속)
+        if self.enable_motion_gate:
+            small = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (80, 60), interpolation=cv2.INTER_AREA)
+            # 전체 평균 대신 가장 크게 변한 블록으로 판단 (손가락만 움직이는 경우도 감지)
+            if (
+                self._last_result is not None
+                and self._prev_small is not None
+                and self._gated_frames < self.max_gated_frames
+                and cv2.absdiff(small, self._prev_small).max() < self.motion_threshold
+            ):
+                result = self._last_result
+                self._gated_frames += 1
+        
+        if result is None:
+            # 추론용으로 축소 (모델은 내부적으로 더 작은 크기로 리사이즈하므로 정확도 영향 적음)
+            # 가로/세로를 같은 배율로 줄여 손 모양이 찌그러지지 않도록 함 (16:9 등 비 4:3 프레임 포함)
+            src = frame
+            frame_h, frame_w = frame.shape[:2]
+            long_side = max(frame_w, frame_h)
+            if self.inference_max_side is not None and long_side > self.inference_max_side:
+                scale = self.inference_max_side / long_side
+                width = max(1, round(frame_w * scale))
+                height = max(1, round(frame_h * scale))
+                if self._small_buf is None or self._small_buf.shape != (height, width, frame.shape[2]):
+                    self._small_buf = np.empty((height, width, frame.shape[2]), dtype=np.uint8)
+                src = cv2.resize(frame, (width, height), dst=self._small_buf, interpolation=cv2.INTER_AREA)
+            
+            # BGR -> RGB 변환 (MediaPipe Tasks 이미지 객체 생성)
+            # 매 프레임 같은 연속(contiguous) 버퍼에 기록하고, detect가 끝날 때까지 유지됨
+            if self._rgb_buf is None or self._rgb_buf.shape != src.shape:
+                self._rgb_buf = np.empty(src.shape, dtype=np.uint8)
+            cv2.cvtColor(src, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=self._rgb_buf)
+            
+            # MediaPipe 처리 (VIDEO 모드는 엄격히 증가하는 ms 타임스탬프 필요)
+            timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+            self._last_timestamp_ms = timestamp_ms
+            result = self.detector.detect_for_video(mp_image, timestamp_ms)
+            
+            # 비교 기준은 마지막으로 추론한 프레임 (느린 움직임이 누적되어도 감지되도록)
+            self._last_result = result
+            self._gated_frames = 0
+            if self.enable_motion_gate:
+                self._prev_small = small
         
-        annotated_frame = frame.copy()
+        # 손이 없으면 원본을 그대로 반환하고, 처음 그릴 때만 복사
+        annotated_frame = frame if draw else None
         hands_data = []
         
-        if result.hand_landmarks:
-            for i, (hand_landmarks, handedness) in enumerate(zip(result.hand_landmarks, result.handedness)):
-                if i >= self.max_num_hands:
-                    break
-                
-                # 첫 번째 손의 랜드마크를 numpy 배열로 변환
-                landmarks = np.array([
-                    [lm.x, lm.y, lm.z] for lm in hand_landmarks
-                ])
-                
-                # EMA 필터 적용
-                # 단순 인덱스 기반으로 필터를 할당하면 손이 잠깐 사라졌다 나타날 때 순서가 바뀔 수 있음
-                # 하지만 일단 간단하게 인덱스 기반으로 처리
-                landmarks = self.filters[i].update(landmarks)
-                
-                # 캘리브레이션 오프셋 적용
-                if self.is_calibrated:
-                    landmarks[:, :2] += self.calibration_offset
-                
+        detections = list(zip(result.hand_landmarks, result.handedness))[:self.max_num_hands]
+        
+        # 손목 위치로 슬롯 배정, 새 손이거나 오래 사라졌던 슬롯의 필터는 초기화
+        slots, reset_slots = self.identity_tracker.assign(
+            [(hand_landmarks[0].x, hand_landmarks[0].y) for hand_landmarks, _ in detections]
+        )
+        for slot in reset_slots:
+            self.ema_filter.reset(slot)
+        
+        if detections:
+            # 랜드마크를 미리 할당된 슬롯별 버퍼에 채움 (LANDMARK_DTYPE)
+            self._present[:] = False
+            for slot, (hand_landmarks, _) in zip(slots, detections):
+                buf = self._lm_buf[slot]
+                for j in range(21):
+                    lm = hand_landmarks[j]
+                    buf[j, 0] = lm.x
+                    buf[j, 1] = lm.y
+                    buf[j, 2] = lm.z
+                self._present[slot] = True
+            
+            # EMA 필터 적용 (감지된 모든 손을 한 번에)
+            smoothed = self.ema_filter.update(self._lm_buf, self._present)
+            
+            # 필터 내부 버퍼는 다음 프레임에 덮어써지므로 감지된 손만 한 번에 복사해서 반환
+            # (호출자가 다른 스레드로 넘기거나 다음 프레임 처리 중에 읽어도 안전)
+            output = smoothed[slots]
+            
+            # 캘리브레이션 오프셋 적용 (복사본에 적용하므로 필터 상태는 오염되지 않음)
+            if self.is_calibrated:
+                output[:, :, :2] += self.calibration_offset
+            
+            for landmarks, (hand_landmarks, handedness) in zip(output, detections):
                 # 정보 저장 (10손가락 지원)
                 label = handedness[0].category_name # 'Left' or 'Right'
                 hands_data.append({
@@ -117,11 +253,10 @@ class HandTracker:
                 })
                 
                 # 시각화 (legacy drawing utils 사용 가능하도록 변환)
-                self._draw_landmarks(annotated_frame, hand_landmarks)
-        
-        # 감지되지 않은 손의 필터 리셋
-        for i in range(len(hands_data), self.max_num_hands):
-            self.filters[i].reset()
+                if draw:
+                    if annotated_frame is frame:
+                        annotated_frame = frame.copy()
+                    self._draw_landmarks(annotated_frame, hand_landmarks)
         
         return hands_data, annotated_frame
 
@@ -130,18 +265,20 @@ class HandTracker:
         # MediaPipe landmarker result를 legacy landmark_list 포맷으로 변환하지 않고 
         # 직접 그리기 위해 내부 구조와 유사하게 mock 객체 활용 가능
         # 여기서는 더 간단하게 opencv로 직접 그리거나 legacy class로 래핑
-        from mediapipe.framework.formats import landmark_pb2
-        hand_landmarks_proto = landmark_pb2.NormalizedLandmarkList()
-        hand_landmarks_proto.landmark.extend([
-            landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z) for lm in hand_landmarks
-        ])
+        # (미리 만든 proto의 좌표만 덮어써서 재사용)
+        proto_landmarks = self._landmark_proto.landmark
+        for j, lm in enumerate(hand_landmarks):
+            proto_lm = proto_landmarks[j]
+            proto_lm.x = lm.x
+            proto_lm.y = lm.y
+            proto_lm.z = lm.z
         
         self.mp_drawing.draw_landmarks(
             frame,
-            hand_landmarks_proto,
+            self._landmark_proto,
             self.mp_hands.HAND_CONNECTIONS,
-            self.mp_drawing_styles.get_default_hand_landmarks_style(),
-            self.mp_drawing_styles.get_default_hand_connections_style()
+            self._landmark_style,
+            self._connection_style
         )
 
     def calibrate(self, landmarks: np.ndarray, target_position: Tuple[float, float], finger_idx: int = 8):
@@ -154,12 +291,12 @@ class HandTracker:
             finger_idx: 기준이 될 손가락 (기본값: 검지 끝=8)
         """
         current_position = landmarks[finger_idx, :2]
-        self.calibration_offset = np.array(target_position) - current_position
+        self.calibration_offset[0] = np.asarray(target_position, dtype=LANDMARK_DTYPE) - current_position
         self.is_calibrated = True
     
     def reset_calibration(self):
         """캘리브레이션 초기화"""
-        self.calibration_offset = np.array([0.0, 0.0])
+        self.calibration_offset.fill(0.0)
         self.is_calibrated = False
 
     def release(self):
@@ -170,58 +307,158 @@ class HandTracker:
         """검지 끝 좌표 반환"""
         return tuple(landmarks[8, :2])
     
-    def get_all_fingertips(self, landmarks: np.ndarray) -> dict:
-        """모든 손가락 끝 좌표 반환"""
-        return {
-            'thumb': tuple(landmarks[4, :2]),
-            'index': tuple(landmarks[8, :2]),
-            'middle': tuple(landmarks[12, :2]),
-            'ring': tuple(landmarks[16, :2]),
-            'pinky': tuple(landmarks[20, :2])
-        }
-    
-    def release(self):
-        """리소스 해제"""
-        self.hands.close()
+    def get_all_fingertips(self, landmarks: np.ndarray) -> np.ndarray:
+        """모든 손가락 끝 좌표 반환: shape (5, 2), 행 순서는 FINGERTIP_NAMES"""
+        return landmarks[self._FINGERTIP_IDX, :2]
 
 
 class WebcamCapture:
     """웹캠 캡처 유틸리티"""
     
-    def __init__(self, camera_id: int = 0, width: int = 640, height: int = 480):
-        self.cap = cv2.VideoCapture(camera_id)
+    def __init__(self, camera_id: int = 0, width: int = 640, height: int = 480, fps: int = 60):
+        # 플랫폼별 캡처 백엔드 명시 (Linux: V4L2, Windows: Media Foundation)
+        if sys.platform.startswith('linux'):
+            backend = cv2.CAP_V4L2
+        elif sys.platform == 'win32':
+            backend = cv2.CAP_MSMF
+        else:
+            backend = cv2.CAP_ANY
+        self.cap = cv2.VideoCapture(camera_id, backend)
+        
+        # MJPG로 받아 YUYV->BGR CPU 변환과 USB 대역폭을 줄임 (해상도 설정 전에 지정)
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.cap.set(cv2.CAP_PROP_FPS, fps)
+        # 드라이버 버퍼를 1장으로 줄여 오래된 프레임이 쌓이지 않도록 함
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         
         if not self.cap.isOpened():
             raise RuntimeError("웹캠을 열 수 없습니다")
+        
+        # 백그라운드 캡처: 최신 프레임 1장과 프레임 번호를 잠금으로 보호해 여러 소비자가 공유
+        self._cond = threading.Condition()
+        self._latest = None
+        self._frame_id = 0
+        # 캡처 스레드 시작/종료는 별도 잠금으로 직렬화 (이전 스레드 종료 전에 새 스레드가 읽지 않도록)
+        self._lifecycle_lock = threading.Lock()
+        self._capture_thread = None
+        self._stop_event = None
+        self._users = 0
     
     def read(self) -> Tuple[bool, Optional[np.ndarray]]:
         """프레임 읽기"""
         return self.cap.read()
     
+    def start(self):
+        """
+        캡처 스레드 사용 시작: 이후 read_latest()로 최신 프레임을 가져옴
+        사용자 수를 세어 첫 사용자에서만 스레드를 시작 (stop()과 짝으로 호출)
+        """
+        with self._lifecycle_lock:
+            self._users += 1
+            if self._capture_thread is not None:
+                return
+            self._stop_event = threading.Event()
+            self._capture_thread = threading.Thread(
+                target=self._capture_loop, args=(self._stop_event,), daemon=True
+            )
+            self._capture_thread.start()
+    
+    def stop(self):
+        """캡처 스레드 사용 종료: 마지막 사용자가 떠나면 스레드를 멈춰 카메라 읽기/디코딩 중단"""
+        with self._lifecycle_lock:
+            self._users = max(self._users - 1, 0)
+            if self._users == 0:
+                self._stop_capture_thread()
+    
+    def _stop_capture_thread(self):
+        """캡처 스레드 종료 대기 및 최신 프레임 비우기 (_lifecycle_lock 보유 상태에서 호출)"""
+        if self._capture_thread is None:
+            return
+        self._stop_event.set()
+        self._capture_thread.join(timeout=1.0)
+        self._capture_thread = None
+        with self._cond:
+            self._latest = None
+    
+    def _capture_loop(self, stop_event: threading.Event):
+        """카메라 프레임을 계속 읽어 최신 프레임 슬롯을 갱신"""
+        while not stop_event.is_set():
+            success, frame = self.cap.read()
+            if not success:
+                time.sleep(0.01)
+                continue
+            with self._cond:
+                self._latest = frame
+                self._frame_id += 1
+                self._cond.notify_all()
+    
+    def read_latest(
+        self, last_frame_id: int = 0, timeout: Optional[float] = None
+    ) -> Tuple[bool, Optional[np.ndarray], int]:
+        """
+        last_frame_id 이후의 새 프레임이 올 때까지 기다려 최신 프레임 반환
+        
+        Args:
+            last_frame_id: 호출자가 마지막으로 받은 프레임 번호 (처음에는 0)
+            timeout: 최대 대기 시간 (초)
+        
+        Returns:
+            (success, frame, frame_id)
+            - frame은 모든 소비자가 공유하므로 수정하면 안 됨 (필요하면 복사본에 작업)
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._latest is not None and self._frame_id > last_frame_id,
+                timeout
+            )
+            if self._latest is None or self._frame_id <= last_frame_id:
+                return False, None, last_frame_id
+            return True, self._latest, self._frame_id
+    
     def release(self):
-        """웹캠 해제"""
+        """웹캠 해제 (사용자 수와 관계없이 캡처 스레드 종료)"""
+        with self._lifecycle_lock:
+            self._users = 0
+            self._stop_capture_thread()
         self.cap.release()
 
 
 if __name__ == "__main__":
     # 테스트 코드
+    # 캡처 스레드 -> 추론 스레드 -> 메인 스레드(화면 출력) 파이프라인
     tracker = HandTracker()
     webcam = WebcamCapture()
+    webcam.start()
     
-    print("손을 웹캠에 보이게 해주세요. 'q'를 누르면 종료됩니다.")
+    results = queue.Queue(maxsize=1)
+    stop_event = threading.Event()
     
-    try:
-        while True:
-            success, frame = webcam.read()
+    def inference_worker():
+        frame_id = 0
+        while not stop_event.is_set():
+            success, frame, frame_id = webcam.read_latest(frame_id, timeout=0.1)
             if not success:
                 continue
             
-            # 좌우 반전 (거울 모드)
+            # 좌우 반전 (거울 모드, 캡처 프레임은 공유되므로 새 배열에 반전)
             frame = cv2.flip(frame, 1)
             
-            hands_data, annotated_frame = tracker.process_frame(frame)
+            # 반환된 랜드마크는 복사본이므로 다음 process_frame 중에도 메인 스레드에서 읽어도 안전
+            _put_latest(results, tracker.process_frame(frame))
+    
+    worker = threading.Thread(target=inference_worker, daemon=True)
+    worker.start()
+    
+    print("손을 웹캠에 보이게 해주세요. 'q'를 누르면 종료됩니다.")
+    
+    try:
+        while True:
+            try:
+                hands_data, annotated_frame = results.get(timeout=0.1)
+            except queue.Empty:
+                continue
             
             if hands_data:
                 landmarks = hands_data[0]['landmarks']
@@ -241,6 +478,8 @@ if __name__ == "__main__":
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 break
     finally:
+        stop_event.set()
+        worker.join(timeout=1.0)
         webcam.release()
         tracker.release()
         cv2.destroyAllWindows()
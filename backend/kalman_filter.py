@@ -0,0 +1,140 @@
+"""
+Kalman Filter
+손 식별(어느 손이 어느 필터 슬롯인지) 유지를 위한 등속 칼만 필터
+"""
+import itertools
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+
+class ConstantVelocityKalmanFilter:
+    """
+    2D 등속 모델 칼만 필터
+    상태: [x, y, vx, vy], 측정: [x, y] (프레임 단위 시간 간격)
+    """
+
+    def __init__(self, process_noise: float = 1e-3, measurement_noise: float = 1e-3):
+        """
+        Args:
+            process_noise: 프로세스 노이즈 (클수록 급격한 움직임을 빨리 따라감)
+            measurement_noise: 측정 노이즈 (클수록 측정값을 덜 신뢰)
+        """
+        self.F = np.array([
+            [1.0, 0.0, 1.0, 0.0],
+            [0.0, 1.0, 0.0, 1.0],
+            [0.0, 0.0, 1.0, 0.0],
+            [0.0, 0.0, 0.0, 1.0],
+        ])
+        self.H = np.array([
+            [1.0, 0.0, 0.0, 0.0],
+            [0.0, 1.0, 0.0, 0.0],
+        ])
+        self.Q = np.eye(4) * process_noise
+        self.R = np.eye(2) * measurement_noise
+
+        self.x = np.zeros(4)
+        self.P = np.eye(4)
+        self.initialized = False
+
+    def predict(self) -> Tuple[float, float]:
+        """다음 프레임 위치 예측"""
+        if self.initialized:
+            self.x = self.F @ self.x
+            self.P = self.F @ self.P @ self.F.T + self.Q
+        return float(self.x[0]), float(self.x[1])
+
+    def update(self, x: float, y: float):
+        """측정값으로 상태 보정 (첫 측정은 그대로 초기 상태로 사용)"""
+        if not self.initialized:
+            self.x[:] = (x, y, 0.0, 0.0)
+            self.P = np.eye(4)
+            self.initialized = True
+            return
+
+        residual = np.array([x, y]) - self.H @ self.x
+        S = self.H @ self.P @ self.H.T + self.R
+        K = self.P @ self.H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ residual
+        self.P = (np.eye(4) - K @ self.H) @ self.P
+
+    def reset(self):
+        """필터 상태 초기화"""
+        self.initialized = False
+
+
+class HandIdentityTracker:
+    """
+    손목 위치 기반 손 식별 유지
+    감지된 손을 칼만 필터 예측 위치와 가장 가까운 슬롯에 배정하여,
+    손이 잠깐 사라졌다 나타나도 같은 슬롯(EMA 필터)을 유지함
+    """
+
+    def __init__(self, num_slots: int = 2, max_missed: int = 6, new_track_cost: float = 0.15):
+        """
+        Args:
+            num_slots: 슬롯(추적할 최대 손) 개수
+            max_missed: 감지되지 않아도 예측만으로 슬롯을 유지할 최대 프레임 수
+            new_track_cost: 빈 슬롯에 배정하는 비용 (정규화 좌표 거리 기준, 이보다 멀면 새 손으로 간주)
+        """
+        self.filters = [ConstantVelocityKalmanFilter() for _ in range(num_slots)]
+        self.missed = [0] * num_slots
+        self.max_missed = max_missed
+        self.new_track_cost = new_track_cost
+
+    def assign(self, positions: Sequence[Tuple[float, float]]) -> Tuple[List[int], List[int]]:
+        """
+        감지된 손목 위치들을 슬롯에 배정
+
+        Args:
+            positions: 감지된 손목 좌표 [(x, y), ...] (슬롯 개수 이하)
+
+        Returns:
+            (slots, reset_slots)
+            - slots: positions와 같은 순서의 배정된 슬롯 인덱스
+            - reset_slots: 새 손이 배정되었거나 오래 감지되지 않아 초기화된 슬롯 인덱스
+              (해당 슬롯의 랜드마크 필터도 초기화해야 함)
+        """
+        predictions = [kf.predict() if kf.initialized else None for kf in self.filters]
+
+        # 슬롯이 최대 2개 수준이므로 모든 배정을 비교 (헝가리안 알고리즘 대신 전수 탐색)
+        best_slots: Optional[Tuple[int, ...]] = None
+        best_cost = float('inf')
+        for slots in itertools.permutations(range(len(self.filters)), len(positions)):
+            cost = 0.0
+            for (x, y), slot in zip(positions, slots):
+                pred = predictions[slot]
+                if pred is None:
+                    cost += self.new_track_cost
+                else:
+                    cost += min(np.hypot(x - pred[0], y - pred[1]), 2 * self.new_track_cost)
+            if cost < best_cost:
+                best_cost = cost
+                best_slots = slots
+
+        slots = list(best_slots) if best_slots is not None else []
+        reset_slots = []
+        for (x, y), slot in zip(positions, slots):
+            pred = predictions[slot]
+            # 빈 슬롯이거나 예측 위치에서 너무 멀면 다른 손으로 보고 슬롯을 새로 시작
+            if pred is None or np.hypot(x - pred[0], y - pred[1]) > self.new_track_cost:
+                self.filters[slot].reset()
+                reset_slots.append(slot)
+            self.filters[slot].update(x, y)
+            self.missed[slot] = 0
+
+        for slot, kf in enumerate(self.filters):
+            if slot in slots or not kf.initialized:
+                continue
+            self.missed[slot] += 1
+            if self.missed[slot] > self.max_missed:
+                kf.reset()
+                self.missed[slot] = 0
+                reset_slots.append(slot)
+
+        return slots, reset_slots
+
+    def reset(self):
+        """모든 슬롯 초기화"""
+        for kf in self.filters:
+            kf.reset()
+        self.missed = [0] * len(self.filters)
@@ -7,6 +7,8 @@ import base64
 import json
 import cv2
 import numpy as np
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
@@ -15,23 +17,75 @@ from contextlib import asynccontextmanager
 from hand_tracker import HandTracker, WebcamCapture
 from gesture_recognizer import GestureRecognizer
 
+try:
+    from turbojpeg import TurboJPEG
+    turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):  # libjpeg-turbo 미설치 시 OpenCV 인코더 사용
+    turbo_jpeg = None
+
 
 # 전역 변수
 tracker: HandTracker = None
 gesture_recognizer: GestureRecognizer = None
 webcam: WebcamCapture = None
+encode_pool: ThreadPoolExecutor = None
+tracker_pool: ThreadPoolExecutor = None
+
+
+def put_latest(queue: asyncio.Queue, item):
+    """큐가 가득 차 있으면 가장 오래된 항목을 버리고 최신 항목을 넣음"""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
+
+
+def read_mirrored_frame(last_frame_id: int):
+    """캡처 스레드의 새 웹캠 프레임을 가져와 좌우 반전 (거울 모드)"""
+    success, frame, frame_id = webcam.read_latest(last_frame_id, timeout=0.1)
+    if success:
+        # 캡처 프레임은 모든 연결이 공유하므로 원본은 두고 새 배열에 반전
+        frame = cv2.flip(frame, 1)
+    return success, frame, frame_id
+
+
+def dumps_json(data: dict) -> str:
+    """orjson(C 확장)으로 JSON 직렬화 (numpy 배열/스칼라도 그대로 직렬화)"""
+    return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+
+
+def track_and_recognize(frame: np.ndarray, draw: bool):
+    """손 추적과 제스처 인식을 한 작업으로 수행 (tracker_pool 스레드에서 호출)"""
+    hands_data, annotated_frame = tracker.process_frame(frame, draw)
+    return hands_data, annotated_frame, gesture_recognizer.recognize(hands_data)
+
+
+def encode_frame(frame: np.ndarray) -> bytes:
+    """프레임을 JPEG(품질 50)으로 인코딩"""
+    if turbo_jpeg is not None:
+        return turbo_jpeg.encode(frame, quality=50)
+    _, buffer = cv2.imencode('.jpg', frame, [
+        cv2.IMWRITE_JPEG_QUALITY, 50
+    ])
+    return buffer.tobytes()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """앱 시작/종료 시 리소스 관리"""
-    global tracker, gesture_recognizer, webcam
+    global tracker, gesture_recognizer, webcam, encode_pool, tracker_pool
     
     print("🖐️ Hand Gesture Keyboard 서버 시작...")
     tracker = HandTracker(ema_alpha=0.3)
+    print(f"🧠 손 추적 추론 장치: {'GPU' if tracker.uses_gpu else 'CPU'}")
     gesture_recognizer = GestureRecognizer()
+    # JPEG 인코딩은 이벤트 루프를 막지 않도록 별도 스레드에서 수행
+    encode_pool = ThreadPoolExecutor(max_workers=2)
+    # 추적기/제스처 인식기는 내부 버퍼/식별 상태/VIDEO 모드 타임스탬프를 공유하므로
+    # 모든 연결의 호출을 단일 스레드에서 순서대로 처리
+    tracker_pool = ThreadPoolExecutor(max_workers=1)
     
     try:
+        # 캡처 스레드는 /ws/hand-tracking 클라이언트가 연결되어 있는 동안만 실행
         webcam = WebcamCapture(camera_id=0)
         print("✅ 웹캠 연결 성공")
     except RuntimeError as e:
@@ -40,11 +94,16 @@ async def lifespan(app: FastAPI):
     
     yield
     
-    # 종료 시 리소스 해제
+    # 종료 시 리소스 해제 (하나가 실패해도 나머지는 해제되도록)
     if webcam:
         webcam.release()
     if tracker:
-        tracker.release()
+        try:
+            tracker.release()
+        except Exception as e:
+            print(f"⚠️ 손 추적기 해제 실패: {e}")
+    encode_pool.shutdown(wait=False)
+    tracker_pool.shutdown(wait=False)
     print("👋 서버 종료")
 
 
@@ -95,97 +154,148 @@ async def websocket_hand_tracking(websocket: WebSocket):
             "fist": {"is_fist": bool, "fist_triggered": bool},
             "dwell": {"dwell_progress": float, "dwell_triggered": bool}
         },
-        "hand_detected": bool,
-        "frame": "base64_encoded_jpeg"  # 선택적
+        "hand_detected": bool
     }
+    비디오 전송이 켜져 있으면 각 tracking 메시지 직후 JPEG 바이너리 메시지가 이어서 전송됨
     """
     await websocket.accept()
     print("🔌 클라이언트 연결됨")
     
-    send_video = True  # 비디오 프레임 전송 여부
+    # 캡처 -> 추적/인식 -> 인코딩/전송 3단계 파이프라인
+    # 캡처 큐는 최신 프레임만 유지 (가득 차면 오래된 프레임을 버림)
+    # 전송 큐는 트리거(pinch/fist/dwell_triggered)가 한 프레임에만 실리므로 tracking 메시지를 버리지 않음
+    loop = asyncio.get_running_loop()
+    capture_q = asyncio.Queue(maxsize=2)
+    send_q = asyncio.Queue(maxsize=2)
     
-    try:
+    async def capture_stage():
+        """웹캠 프레임 수신 (캡처 스레드의 최신 프레임 대기는 스레드에서 수행)"""
+        frame_id = 0
         while True:
-            # 클라이언트 메시지 확인 (비차단)
-            try:
-                message = await asyncio.wait_for(
-                    websocket.receive_text(),
-                    timeout=0.001
-                )
-                data = json.loads(message)
-                
-                if data.get("type") == "config":
-                    send_video = data.get("send_video", True)
-                elif data.get("type") == "reset_calibration":
-                    if tracker:
-                        tracker.reset_calibration()
-                        print("📍 캘리브레이션 초기화")
-                elif data.get("type") == "calibrate":
-                    if tracker and "target" in data:
-                        target = data["target"]
-                        finger_idx = data.get("finger", 8)
-                        # 현재 랜드마크가 있을 때만 캘리브레이션 수행
-                        success, frame = webcam.read()
-                        if success:
-                            hands_data, _ = tracker.process_frame(frame)
-                            if hands_data:
-                                # 첫 번째 감지된 손을 기준으로 캘리브레이션
-                                tracker.calibrate(hands_data[0]['landmarks'], target, finger_idx)
-                                print(f"📍 캘리브레이션 완료: Target {target}")
-                        
-            except asyncio.TimeoutError:
-                pass
-            except json.JSONDecodeError:
-                pass
-            
             if webcam is None:
-                await websocket.send_json({
+                await send_q.put(({
                     "type": "error",
                     "message": "웹캠이 연결되지 않았습니다"
-                })
+                }, None))
                 await asyncio.sleep(1)
                 continue
             
-            # 프레임 캡처
-            success, frame = webcam.read()
+            success, frame, frame_id = await loop.run_in_executor(None, read_mirrored_frame, frame_id)
             if not success:
                 await asyncio.sleep(0.01)
                 continue
             
-            # 좌우 반전 (거울 모드)
-            frame = cv2.flip(frame, 1)
-            
-            # 손 추적
-            # 1. 손 추적 (이제 리스트를 반환함)
-            hands_data, annotated_frame = tracker.process_frame(frame)
-            
-            # 2. 제스처 인식
-            gesture_results = gesture_recognizer.recognize(hands_data)
-            
-            # 결과 전송 객체 구성
-            response = {
-                "type": "tracking",
-                "hands": gesture_results, 
-                "hand_detected": len(hands_data) > 0
-            }
-            
-            # 비디오 프레임 전송 (선택적)
-            if send_video:
-                _, buffer = cv2.imencode('.jpg', annotated_frame, [
-                    cv2.IMWRITE_JPEG_QUALITY, 50
-                ])
-                response["video_frame"] = base64.b64encode(buffer).decode('utf-8')
-            
-            await websocket.send_json(response)
+            put_latest(capture_q, frame)
+    
+    async def process_stage():
+        """제어 메시지 처리, 손 추적 및 제스처 인식"""
+        send_video = True  # 비디오 프레임 전송 여부
+        latest_hands = []
+        # 제어 메시지 수신과 프레임 대기를 함께 기다려, 프레임이 오지 않아도(웹캠 없음 등)
+        # 제어 메시지와 연결 해제를 바로 처리
+        recv_task = asyncio.create_task(websocket.receive_text())
+        frame_task = asyncio.create_task(capture_q.get())
+        
+        try:
+            while True:
+                done, _ = await asyncio.wait({recv_task, frame_task}, return_when=asyncio.FIRST_COMPLETED)
+                
+                if recv_task in done:
+                    # 연결 해제 시 WebSocketDisconnect가 여기서 전파됨
+                    message = recv_task.result()
+                    recv_task = asyncio.create_task(websocket.receive_text())
+                    
+                    try:
+                        data = json.loads(message)
+                    except json.JSONDecodeError:
+                        data = {}
+                    
+                    if data.get("type") == "config":
+                        send_video = data.get("send_video", True)
+                    elif data.get("type") == "reset_calibration":
+                        if tracker:
+                            await loop.run_in_executor(tracker_pool, tracker.reset_calibration)
+                            print("📍 캘리브레이션 초기화")
+                    elif data.get("type") == "calibrate":
+                        if tracker and "target" in data:
+                            target = data["target"]
+                            finger_idx = data.get("finger", 8)
+                            # 현재 랜드마크가 있을 때만 캘리브레이션 수행 (가장 최근 추적 결과 사용)
+                            if latest_hands:
+                                # 첫 번째 감지된 손을 기준으로 캘리브레이션
+                                await loop.run_in_executor(
+                                    tracker_pool, tracker.calibrate, latest_hands[0]['landmarks'], target, finger_idx
+                                )
+                                print(f"📍 캘리브레이션 완료: Target {target}")
+                
+                if frame_task not in done:
+                    continue
+                frame = frame_task.result()
+                frame_task = asyncio.create_task(capture_q.get())
+                
+                # 손 추적 + 제스처 인식 (추적기 전용 스레드에서 한 작업으로 수행)
+                # 비디오를 보내지 않으면 프레임 복사/시각화 생략
+                hands_data, annotated_frame, gesture_results = await loop.run_in_executor(
+                    tracker_pool, track_and_recognize, frame, send_video
+                )
+                latest_hands = hands_data
+                
+                # 결과 전송 객체 구성
+                response = {
+                    "type": "tracking",
+                    "hands": gesture_results, 
+                    "hand_detected": len(hands_data) > 0
+                }
+                
+                await send_q.put((response, annotated_frame))
+        finally:
+            for task in (recv_task, frame_task):
+                if task.done():
+                    # 이미 끝난 태스크의 예외를 회수 ("Task exception was never retrieved" 경고 방지)
+                    if not task.cancelled():
+                        task.exception()
+                else:
+                    task.cancel()
+    
+    async def send_stage():
+        """비디오 프레임 인코딩 및 전송"""
+        while True:
+            response, annotated_frame = await send_q.get()
             
-            # 프레임 레이트 제한 (~30fps)
-            await asyncio.sleep(0.033)
+            # 비디오 프레임은 base64/JSON 대신 바이너리 메시지로 전송 (선택적)
+            # 전송이 밀려 더 새로운 결과가 대기 중이면 이 프레임의 JPEG만 생략 (tracking 메시지는 항상 전송)
+            jpeg = None
+            if annotated_frame is not None and send_q.empty():
+                jpeg = await loop.run_in_executor(encode_pool, encode_frame, annotated_frame)
             
+            # JSON은 텍스트 메시지, 비디오는 바이너리 메시지로 구분
+            await websocket.send_text(dumps_json(response))
+            if jpeg is not None:
+                await websocket.send_bytes(jpeg)
+    
+    # 첫 클라이언트가 연결되면 캡처 시작, 마지막 클라이언트가 떠나면 중단 (WebcamCapture가 사용자 수 관리)
+    if webcam:
+        webcam.start()
+    
+    tasks = [
+        asyncio.create_task(capture_stage()),
+        asyncio.create_task(process_stage()),
+        asyncio.create_task(send_stage())
+    ]
+    
+    try:
+        await asyncio.gather(*tasks)
     except WebSocketDisconnect:
         print("🔌 클라이언트 연결 해제")
     except Exception as e:
         print(f"❌ WebSocket 오류: {e}")
         await websocket.close()
+    finally:
+        for task in tasks:
+            task.cancel()
+        if webcam:
+            # 캡처 스레드 종료 대기(최대 한 프레임)가 이벤트 루프를 막지 않도록 스레드에서 수행
+            await loop.run_in_executor(None, webcam.stop)
 
 
 @app.websocket("/ws/frame-input")
@@ -202,6 +312,7 @@ async def websocket_frame_input(websocket: WebSocket):
     """
     await websocket.accept()
     print("🔌 프레임 입력 클라이언트 연결됨")
+    loop = asyncio.get_running_loop()
     
     try:
         while True:
@@ -217,24 +328,18 @@ async def websocket_frame_input(websocket: WebSocket):
                 if frame is None:
                     continue
                 
-                # 손 추적
-                landmarks, _ = tracker.process_frame(frame)
+                # 손 추적 (멀티 핸드) 및 제스처 인식
+                hands_data, _, gesture_results = await loop.run_in_executor(
+                    tracker_pool, track_and_recognize, frame, False
+                )
                 
                 response = {
                     "type": "tracking",
-                    "hand_detected": landmarks is not None
+                    "hands": gesture_results,
+                    "hand_detected": len(hands_data) > 0
                 }
                 
-                if landmarks is not None:
-                    gestures = gesture_recognizer.recognize(landmarks)
-                    response["pointer"] = list(gestures["pointer"])
-                    response["gestures"] = {
-                        "pinch": gestures["pinch"],
-                        "fist": gestures["fist"],
-                        "dwell": gestures["dwell"]
-                    }
-                
-                await websocket.send_json(response)
+                await websocket.send_text(dumps_json(response))
                 
     except WebSocketDisconnect:
         print("🔌 프레임 입력 클라이언트 연결 해제")
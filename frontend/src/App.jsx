@@ -25,6 +25,8 @@ function App() {
 
   const automatonRef = useRef(new HangulAutomaton());
   const wsRef = useRef(null);
+  // 현재 비디오 프레임의 blob URL (새 프레임이 오거나 연결이 끊기면 해제)
+  const frameUrlRef = useRef(null);
   const hoverStartTimeRef = useRef({
     Left: { thumb: null, index: null, middle: null, ring: null, pinky: null },
     Right: { thumb: null, index: null, middle: null, ring: null, pinky: null }
@@ -35,8 +37,16 @@ function App() {
   });
 
   useEffect(() => {
+    const releaseFrameUrl = () => {
+      if (frameUrlRef.current) {
+        URL.revokeObjectURL(frameUrlRef.current);
+        frameUrlRef.current = null;
+      }
+    };
+
     const connect = () => {
       const ws = new WebSocket('ws://localhost:8000/ws/hand-tracking');
+      ws.binaryType = 'arraybuffer';
       wsRef.current = ws;
 
       ws.onopen = () => {
@@ -45,6 +55,16 @@ function App() {
       };
 
       ws.onmessage = (event) => {
+        // 바이너리 메시지: 직전 tracking 메시지에 대응하는 JPEG 비디오 프레임
+        if (event.data instanceof ArrayBuffer) {
+          // 이전 프레임은 그려지지 않았더라도(렌더 배칭 등) 여기서 해제
+          releaseFrameUrl();
+          const frameUrl = URL.createObjectURL(new Blob([event.data], { type: 'image/jpeg' }));
+          frameUrlRef.current = frameUrl;
+          setTrackingData(prev => (prev ? { ...prev, video_frame: frameUrl } : prev));
+          return;
+        }
+
         try {
           const data = JSON.parse(event.data);
           if (data.type === 'tracking') {
@@ -93,6 +113,7 @@ function App() {
 
       ws.onclose = () => {
         setConnectionStatus('disconnected');
+        releaseFrameUrl();
         // 연결이 완전히 끊겼을 때만 다시 로딩 표시 (선택 사항)
         // setIsLoading(true); 
         setTimeout(connect, 3000);
@@ -104,6 +125,7 @@ function App() {
     connect();
     return () => {
       if (wsRef.current) wsRef.current.close();
+      releaseFrameUrl();
     };
   }, []); // 의존성 배열에서 isLoading 제거 (무한 재연결 방지)
 
@@ -13,7 +13,9 @@ const HandCanvas = ({ trackingData }) => {
         // Draw background video frame if available
         if (video_frame) {
             const img = new Image();
+            img.onerror = () => URL.revokeObjectURL(video_frame);
             img.onload = () => {
+                URL.revokeObjectURL(video_frame);
                 ctx.clearRect(0, 0, canvas.width, canvas.height);
                 ctx.drawImage(img, 0, 0, canvas.width, canvas.height);
 
@@ -59,7 +61,7 @@ const HandCanvas = ({ trackingData }) => {
                     });
                 }
             };
-            img.src = `data:image/jpeg;base64,${video_frame}`;
+            img.src = video_frame;
         }
     }, [trackingData]);
 